@@ -27,6 +27,8 @@ verbose = 0
 
 import platform, sys, os, os.path, math, shlex, subprocess, shutil, re
 import xml.etree.ElementTree
+import concurrent.futures
+import tempfile
 import logging
 
 log = logging.getLogger("sam_2_xp12")
@@ -39,40 +41,71 @@ remove_sam_lib_objects = False
 
 deg_2_m = 60 * 1982.0   # ° lat to m
 
+# length ranges of the XP12 tunnels, the longest one that fits wins
+jw_lcodes = ((20, 47, 3), (17, 38, 2), (14, 29, 1), (11, 23, 0))
+
 def normalize_hdg(hdg):
-    hdg = math.fmod(hdg, 360.0)
-    if hdg < 0:
-        hdg += 360.0
-    return hdg
+    return hdg % 360.0  # unlike fmod Python's % is never negative for a positive divisor
 
 # position + dist@hdg, fortunately the earth is flat
 def pos_plus_vec(lat, lon, dist, hdg):
     cos_lat = math.cos(math.radians(lat))
-    return lat + dist / deg_2_m * math.cos(math.radians(hdg)), \
-           lon + dist / (deg_2_m * cos_lat) * math.sin(math.radians(hdg))
+    hdg = math.radians(hdg)
+    dist = dist / deg_2_m
+    return lat + dist * math.cos(hdg), \
+           lon + dist / cos_lat * math.sin(hdg)
+
+def find_dsf_files(dir):
+    """ Return all .dsf files below dir, top down like os.walk """
+    dsf_files = []
+    sub_dirs = []
+    with os.scandir(dir) as it:
+        for e in it:
+            if e.is_dir(follow_symlinks = False):
+                sub_dirs.append(e.path)
+            elif e.name.endswith(".dsf"):
+                dsf_files.append(e.path)
+
+    for d in sub_dirs:
+        dsf_files.extend(find_dsf_files(d))
+
+    return dsf_files
+
+dsf_tile_re = re.compile(r"([+-]\d{2})([+-]\d{3})\.dsf$")
+
+def dsf_tile(fname):
+    """ Return the (lat, lon) of the 1° tile from a dsf file name like +50+008.dsf or None """
+    m = dsf_tile_re.search(fname)
+    if m is None:
+        return None
+
+    return int(m.group(1)), int(m.group(2))
 
 class ObjPos():
-    lat = None
-    lon = None
-    hdg = None
+    __slots__ = ('lat', 'lon', 'hdg', 'lon_2_m')
 
-    def distance(self, obj_pos): # -> m
-        if self.lat is None or obj_pos.lat is None: # it's a filter
-            return 1.0E10
+    def cache_lon_2_m(self):
+        """ Precompute ° lon to m at lat for objects indexed in a PosGrid, distance2_to() needs it """
+        self.lon_2_m = deg_2_m * math.cos(math.radians(self.lat))
 
-        dlat_m = deg_2_m * (self.lat - obj_pos.lat)
-        dlon_m = deg_2_m * (self.lon - obj_pos.lon) * math.cos(math.radians(self.lat))
-        return math.sqrt(dlat_m**2 + dlon_m**2)
+    def distance2_to(self, lat, lon): # -> m²
+        dlat_m = deg_2_m * (self.lat - lat)
+        dlon_m = (self.lon - lon) * self.lon_2_m
+        return dlat_m * dlat_m + dlon_m * dlon_m
 
 class SAM_jw(ObjPos):
-    obj_ref = None  # gets assigned if jw is matched by an object
+    __slots__ = ('name', 'height', 'length', 'max_extend', 'jw_hdg', 'cab_hdg', 'lcode', 'obj_ref',
+                 'rotunda_pts')
 
     def __init__(self, attrib):
         #print(attrib)
+        self.obj_ref = None  # gets assigned if jw is matched by an object
+        self.rotunda_pts = None
         self.name = attrib['name']
         self.lat = float(attrib['latitude'])
         self.lon = float(attrib['longitude'])
         self.hdg = float(attrib['heading'])
+        self.cache_lon_2_m()
         self.height = float(attrib['height'])
         self.length = float(attrib['cabinPos'])
         self.max_extend = float(attrib['maxExtent'])
@@ -89,14 +122,10 @@ class SAM_jw(ObjPos):
 
         total_length = self.length + self.max_extend
         self.lcode = -1
-        if self.length >= 11 and self.length <= 23:
-            self.lcode = 0
-        if self.length >= 14 and self.length <= 29:
-            self.lcode = 1
-        if self.length >= 17 and self.length <= 38:
-            self.lcode = 2
-        if self.length >= 20 and self.length <= 47:
-            self.lcode = 3
+        for min_len, max_len, lcode in jw_lcodes:
+            if min_len <= self.length <= max_len:
+                self.lcode = lcode
+                break
 
         if self.lcode < 0:
             log.warning(f"{self}")
@@ -107,6 +136,24 @@ class SAM_jw(ObjPos):
         return f"sam_jw '{self.name}' {self.lat} {self.lon}, length {self.length}m, extension {self.max_extend}m, " +\
                f"jw hdg: {self.jw_hdg}°, cab hdg {self.cab_hdg}°"
 
+    def rotunda_points(self):
+        """ POLYGON_POINTs of the rotunda segment, the same for every dsf so computed once """
+        if self.rotunda_pts is None:
+            if self.obj_ref:
+                lat2 = self.obj_ref.lat
+                lon2 = self.obj_ref.lon
+                hdg = self.obj_ref.hdg
+            else:
+                lat2 = self.lat
+                lon2 = self.lon
+                hdg = self.hdg
+
+            lat1, lon1 = pos_plus_vec(lat2, lon2, -jw_rotunda_length, hdg)
+            self.rotunda_pts = f"POLYGON_POINT {lon1:0.7f} {lat1:0.7f} 0.0\n" + \
+                               f"POLYGON_POINT {lon2:0.7f} {lat2:0.7f} 0.0"
+
+        return self.rotunda_pts
+
     def apt_1500(self):
         jw_hdg = normalize_hdg(self.jw_hdg)
         cab_hdg = normalize_hdg(self.jw_hdg + self.cab_hdg)
@@ -115,51 +162,112 @@ class SAM_jw(ObjPos):
                f"{jw_type} {self.lcode} {jw_hdg:0.1f} {self.length:0.1f} {cab_hdg:0.1f}"
 
 class SAM_dock(ObjPos):
+    __slots__ = ()
+
     def __init__(self, attrib):
         self.lat = float(attrib['latitude'])
         self.lon = float(attrib['longitude'])
         self.hdg = normalize_hdg(90 + float(attrib['heading']))
+        self.cache_lon_2_m()
 
     def __repr__(self):
         return f"sam_dock {self.lat} {self.lon} {self.hdg}°"
 
+class PosGrid():
+    """ Index positions in a grid with cells of radius so a match
+        only has to look at the 3x3 cells around a position """
+
+    def __init__(self, objs, radius):
+        # compare squared distances, saves the sqrt; a radius <= 0 matches nothing
+        self.radius2 = radius * radius if radius > 0 else -1.0
+        radius = max(radius, 0.01)
+        max_lat = max([abs(o.lat) for o in objs], default = 0.0)
+        self.cell_lat = radius / deg_2_m
+        self.cell_lon = radius / (deg_2_m * math.cos(math.radians(min(max_lat, 89.0))))
+
+        self.grid = {}
+        for o in objs:
+            self.grid.setdefault(self.key(o.lat, o.lon), []).append(o)
+
+    def key(self, lat, lon):
+        return math.floor(lat / self.cell_lat), math.floor(lon / self.cell_lon)
+
+    def match(self, obj_pos):
+        """ Return all indexed objects within radius of obj_pos """
+        lat, lon = obj_pos.lat, obj_pos.lon
+        kx, ky = self.key(lat, lon)
+        objs = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for o in self.grid.get((kx + dx, ky + dy), ()):
+                    if o.distance2_to(lat, lon) < self.radius2:
+                        objs.append(o)
+
+        return objs
+
+    def has_match(self, obj_pos):
+        """ Return whether any indexed object is within radius of obj_pos """
+        lat, lon = obj_pos.lat, obj_pos.lon
+        kx, ky = self.key(lat, lon)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for o in self.grid.get((kx + dx, ky + dy), ()):
+                    if o.distance2_to(lat, lon) < self.radius2:
+                        return True
+
+        return False
+
 class SAM():
     def __init__(self):
         self.jetways = []
         self.docks = []
 
-        root = xml.etree.ElementTree.parse("sam.xml").getroot()
-        for e in root.find('jetways').findall('jetway'):
-            jw = SAM_jw(e.attrib)
-            if 3.5 <= jw.height and jw.height <= 6.0 and jw.lcode >= 0: # only in the range of XP12
-                self.jetways.append(jw)
+        # stream the elements, no need to build the full tree
+        for _, e in xml.etree.ElementTree.iterparse("sam.xml", events = ("end",)):
+            if e.tag == "jetway":
+                jw = SAM_jw(e.attrib)
+                if 3.5 <= jw.height and jw.height <= 6.0 and jw.lcode >= 0: # only in the range of XP12
+                    self.jetways.append(jw)
+            elif e.tag == "dock":
+                self.docks.append(SAM_dock(e.attrib))
+            else:
+                continue
 
-        for e in root.find('docks').findall('dock'):
-            self.docks.append(SAM_dock(e.attrib))
+            e.clear()
 
-    def match_docks(self, obj_ref):
-        for dock in self.docks:
-            if dock.distance(obj_ref) < 1:
-                return True
+        # 1° tiles that can contain objects matching a jetway or dock
+        self.tiles = set()
+        radius = max(jw_match_radius, 1.0)
+        for o in self.jetways + self.docks:
+            d_lat = radius / deg_2_m
+            d_lon = radius / (deg_2_m * math.cos(math.radians(min(abs(o.lat), 89.0))))
+            for lat in (o.lat - d_lat, o.lat + d_lat):
+                for lon in (o.lon - d_lon, o.lon + d_lon):
+                    self.tiles.add((math.floor(lat), math.floor(lon)))
 
-        return False
+        self.jw_grid = PosGrid(self.jetways, jw_match_radius)
+        self.dock_grid = PosGrid(self.docks, 1.0)
 
-class ObjectRef(ObjPos):
-    sam_jw = None  # backlink to sam definition
+    def match_jetways(self, obj_ref):
+        """ Return all jetways within jw_match_radius of obj_ref """
+        return self.jw_grid.match(obj_ref)
 
-    split_3 = re.compile("([^ ]+) +([^ ]+) +(.*)")          # 2 words + remainder
+    def match_docks(self, obj_ref):
+        return self.dock_grid.has_match(obj_ref)
 
-    def __init__(self, obj, line):
+class ObjectRef(ObjPos):
+    __slots__ = ('obj', 'type', 'params', 'sam_jw', 'is_dock')
+
+    def __init__(self, obj, type, params):
         self.obj = obj
-        m = self.split_3.match(line)
-        self.type = m.group(1)
-        id = int(m.group(2))
-        assert id == obj.id
+        self.type = type
+        self.sam_jw = None  # backlink to sam definition
+        self.is_dock = False
 
         # we try to keep params verbatim for easier diff of text files
-        self.params = m.group(3)
+        self.params = params
 
-        words = self.params.split()
+        words = params.split()
         self.lon = float(words[0])
         self.lat = float(words[1])
 
@@ -184,26 +292,39 @@ class ObjectRef(ObjPos):
 
         return f"{self.type} {id} {self.params}"
 
+sam_jw_files = {}   # .obj path -> contains a sam dataref, shared by all tiles
+
 class ObjectDef():
-    sam_checked = False
-    sam_jw = False
-    is_jetway = False
-    is_dock = False
+    __slots__ = ('id', 'name', 'sam_checked', 'sam_jw', 'is_jetway', 'is_dock')
 
     def __init__(self, id, name):
         self.id = id
         self.name = name
+        self.sam_checked = False
+        self.sam_jw = False
+        self.is_jetway = False
+        self.is_dock = False
 
     def is_sam_jw(self):
         """ Check whether .OBJ file contains a sam dataref"""
         if not self.sam_checked:
             self.sam_checked = True
-            if os.path.isfile(self.name):
-                for l in open(self.name, "r").readlines():
-                    if l.find("sam/jetway/rotate1") >= 0:
-                        self.sam_jw = True
-                        log.info(f"{self} is a SAM controlled jetway obj")
-                        break
+
+            # the same .obj is usually referenced from several tiles
+            path = os.path.abspath(self.name)
+            sam_jw = sam_jw_files.get(path)
+            if sam_jw is None:
+                sam_jw = False
+                if os.path.isfile(path):
+                    # a single substring scan of the raw file, no decoding and no line loop
+                    with open(path, "rb") as f:
+                        if b"sam/jetway/rotate1" in f.read():
+                            sam_jw = True
+                            log.info(f"{self} is a SAM controlled jetway obj")
+
+                sam_jw_files[path] = sam_jw
+
+            self.sam_jw = sam_jw
 
         return self.sam_jw
 
@@ -222,10 +343,17 @@ class Dsf():
         base, _ = os.path.splitext(self.fname) # dst folder
         self.dsf_base = base.replace("Earth nav data.pre_s2n", "Earth nav data")
 
-        dsf_txt = self.dsf_base + ".txt_pre"
+        # the intermediate text is only read back, keep it off the scenery drive
+        with tempfile.TemporaryDirectory(prefix = "sam_2_xp12_") as tmp_dir:
+            if DEBUG_PARSER:
+                dsf_txt = self.dsf_base + ".txt_pre"    # keep it for comparison with the output
+            else:
+                dsf_txt = os.path.join(tmp_dir, "dsf.txt_pre")
 
-        self.run_cmd(f'"{dsf_tool}" -dsf2text "{self.fname}" "{dsf_txt}"')
+            self.run_cmd([dsf_tool, "-dsf2text", self.fname, dsf_txt])
+            self.parse(dsf_txt)
 
+    def parse(self, dsf_txt):
         self.dsf_lines = [] # anything with __repr__ method
 
         self.jw_facade_id = 0
@@ -233,40 +361,59 @@ class Dsf():
         self.object_defs = []
         self.object_refs = []
 
-        for l in open(dsf_txt, "r").readlines():
-            l = l.rstrip()
-
-            if l.find("OBJECT_DEF") == 0:
-                l = ObjectDef(obj_id, l[11:])   # object def can contain blanks
-                self.object_defs.append(l)
-                obj_id += 1
-            elif l.find("OBJECT") == 0:         # OBJECT[_AGL|_MSL]
-                id = int(l.split()[1])
-                l = ObjectRef(self.object_defs[id], l)
-                self.object_refs.append(l)
-            elif l.find("POLYGON_DEF") == 0:
-                self.jw_facade_id += 1          # just count jw_facade_id
-
-            self.dsf_lines.append(l)
+        # stream the file, it can be large
+        # object paths are utf-8, bytes that are not survive the round trip as surrogates
+        with open(dsf_txt, "r", encoding = "utf-8", errors = "surrogateescape", buffering = 1 << 20) as f:
+            for l in f:
+                l = l.rstrip()
+
+                # most lines are polygon points, they only pay for 2 tests
+                if l.startswith("OBJECT"):
+                    if l.startswith("_DEF", 6):     # OBJECT_DEF
+                        # object def can contain blanks, the same names repeat across tiles
+                        l = ObjectDef(obj_id, sys.intern(l[11:]))
+                        self.object_defs.append(l)
+                        obj_id += 1
+                    else:                               # OBJECT[_AGL|_MSL]
+                        ref_type, id, params = l.split(None, 2)   # 2 words + remainder
+                        l = ObjectRef(self.object_defs[int(id)], ref_type, params)
+                        self.object_refs.append(l)
+                elif l.startswith("POLYGON_DEF"):
+                    self.jw_facade_id += 1          # just count jw_facade_id
+
+                self.dsf_lines.append(l)
 
     def __repr__(self):
         return f"{self.fname}"
 
-    def run_cmd(self, cmd):
-        # "shell = True" is not needed on Windows, bombs on Lx
-        out = subprocess.run(shlex.split(cmd), capture_output = True)
+    def run_cmd(self, argv):
+        # pass argv directly, no shell and no quoting
+        # stdout of dsf_tool can be huge and is never looked at
+        out = subprocess.run(argv, stdout = subprocess.DEVNULL, stderr = subprocess.PIPE,
+                             creationflags = run_cmd_flags)
         if out.returncode != 0:
+            # quote the way the platform's shell does, so the command can be rerun as logged
+            if platform.system() == 'Windows':
+                cmd = subprocess.list2cmdline(argv)
+            else:
+                cmd = shlex.join(argv)
             log.error(f"Can't run {cmd}: {out}")
             sys.exit(2)
 
     def filter_sam(self, sam):
-        for jw in sam.jetways:
-            candidates = []
+        # find possible jetway candidates by proximity, finding docks is simpler
+        jw_candidates = {}
+        for o_r in self.object_refs:
+            for jw in sam.match_jetways(o_r):
+                jw_candidates.setdefault(jw, []).append(o_r)
 
-            # find possible candidates by proximity
-            for o_r in self.object_refs:
-                if jw.distance(o_r) < jw_match_radius:
-                    candidates.append(o_r)
+            if sam.match_docks(o_r):
+                o_r.is_dock = True
+                o_r.obj.is_dock = True
+                self.n_docks += 1
+
+        for jw in sam.jetways:
+            candidates = jw_candidates.get(jw, [])
 
             # check if one of these is a SAM jetway
             # then mark this alone
@@ -289,22 +436,22 @@ class Dsf():
                     obj.is_jetway = True
                     self.n_jw += 1
 
-        # finding docks is simpler
-        for o_r in self.object_refs:
-            if sam.match_docks(o_r):
-                o_r.is_dock = True
-                o_r.obj.is_dock = True
-                self.n_docks += 1
-
     def write(self):
         dsf_txt = self.dsf_base + ".txt"
-        with open(dsf_txt, "w") as f:
-            for l in self.dsf_lines:
+
+        # build the whole file and write it in one go
+        lines = []
+        for l in self.dsf_lines:
+            if l.__class__ is not str:     # plain lines go out as they are
                 if l.__class__ is ObjectDef:
-                    f.write(f"# {l.id}\n")
-                f.write(f"{l}\n")
+                    lines.append(f"# {l.id}")
+                l = repr(l)
+            lines.append(l)
+
+        with open(dsf_txt, "w", encoding = "utf-8", errors = "surrogateescape", buffering = 1 << 20) as f:
+            f.write("\n".join(lines) + "\n")
 
-        self.run_cmd(f'"{dsf_tool}" -text2dsf "{dsf_txt}" "{self.dsf_base}.dsf"')
+        self.run_cmd([dsf_tool, "-text2dsf", dsf_txt, f"{self.dsf_base}.dsf"])
 
     def remove_sam(self):
         changed = False
@@ -313,7 +460,7 @@ class Dsf():
         for o in self.object_defs:
             if ((o.is_jetway or o.is_dock) or
                 (remove_sam_lib_objects and
-                    (o.name.find("SAM_Library") >= 0 or o.name.find("SAM3_Library") >= 0))):
+                    ("SAM_Library" in o.name or "SAM3_Library" in o.name))):
                 o.id = -1   # delete
                 changed = True
             else:
@@ -333,23 +480,9 @@ class Dsf():
                 log.warning(f"Unmatched sam jetway: {jw}")
                 continue    # sam definition is not matched by an object
 
-            if jw.obj_ref:
-                lat2 = jw.obj_ref.lat
-                lon2 = jw.obj_ref.lon
-                hdg = jw.obj_ref.hdg
-            else:
-                lat2 = jw.lat
-                lon2 = jw.lon
-                hdg = jw.hdg
-
-            lat1, lon1 = pos_plus_vec(lat2, lon2, -jw_rotunda_length, hdg)
-
-            self.dsf_lines.append(f"# '{jw.name}'\nBEGIN_POLYGON {self.jw_facade_id} 5 3")
-            self.dsf_lines.append("BEGIN_WINDING");
-            self.dsf_lines.append(f"POLYGON_POINT {lon1:0.7f} {lat1:0.7f} 0.0")
-            self.dsf_lines.append(f"POLYGON_POINT {lon2:0.7f} {lat2:0.7f} 0.0")
-            self.dsf_lines.append("END_WINDING")
-            self.dsf_lines.append("END_POLYGON")
+            # one multi line entry per rotunda
+            self.dsf_lines.append(f"# '{jw.name}'\nBEGIN_POLYGON {self.jw_facade_id} 5 3\n" +
+                                  f"BEGIN_WINDING\n{jw.rotunda_points()}\nEND_WINDING\nEND_POLYGON")
 
 
 ###########
@@ -416,8 +549,10 @@ if jw_type is None:
     usage()
 
 dsf_tool = os.path.join(os.path.dirname(sys.argv[0]), 'DSFTool')
+run_cmd_flags = 0
 if platform.system() == 'Windows':
     dsf_tool += ".exe"
+    run_cmd_flags = subprocess.CREATE_NO_WINDOW  # output is redirected, no console needed
 
 sanity_checks = True
 if not os.path.isfile(dsf_tool):
@@ -455,17 +590,22 @@ if verbose > 1:
     for d in sam.docks:
         log.info(f" {d}")
 
-dsf_list = []
-for dir, dirs, files in os.walk(src_dir):
-    for f in files:
-        _, ext = os.path.splitext(f)
-        if ext != '.dsf':
-            continue
+dsf_files = []
+n_skipped = 0
+for full_name in find_dsf_files(src_dir):
+    # a tile without SAM objects can't change unless we remove the SAM libraries
+    tile = dsf_tile(full_name)
+    if not (remove_sam_lib_objects or DEBUG_PARSER or tile is None or tile in sam.tiles):
+        log.info(f"Skipping {full_name}, no SAM jetways or docks in tile")
+        n_skipped += 1
+        continue
 
-        full_name = os.path.join(dir, f)
-        log.info(f"Processing {full_name}")
-        dsf_list.append(Dsf(full_name))
+    log.info(f"Processing {full_name}")
+    dsf_files.append(full_name)
 
+# the time goes into dsf_tool so threads are good enough to keep all cores busy
+with concurrent.futures.ThreadPoolExecutor(max_workers = os.cpu_count()) as ex:
+    dsf_list = list(ex.map(Dsf, dsf_files))
 
 n_dsf_jw = 0
 n_dsf_docks = 0
@@ -504,39 +644,60 @@ for dsf in dsf_list:
 log.info(f"Identified {n_dsf_jw} jetways and {n_dsf_docks} docks in .dsf files")
 
 log.info("Removing sam jetways and docks from dsf and creating rotundas")
+dsf_changed = []
 for dsf in dsf_list:
     if DEBUG_PARSER:
-        dsf.write()
+        dsf_changed.append(dsf)
     else:
         if dsf.remove_sam():
             dsf.add_rotundas(sam)
-            dsf.write()
+            dsf_changed.append(dsf)
+
+with concurrent.futures.ThreadPoolExecutor(max_workers = os.cpu_count()) as ex:
+    list(ex.map(Dsf.write, dsf_changed))
 
 if DEBUG_PARSER:
     sys.exit(0)
 
 log.info("Creating XP12 jetways in apt.dat")
-apt_lines = open("Earth nav data.pre_s2n/apt.dat", "r").readlines()
-with open("Earth nav data/apt.dat", "w") as f:
-    for l in apt_lines:
-        if l.find("99") == 0:
-            for jw in sam.jetways:
-                if not jw.obj_ref is None and jw.lcode >= 0:
-                    f.write(f"{jw.apt_1500()}\n")
-        f.write(l)
+jw_block = "".join(f"{jw.apt_1500()}\n" for jw in sam.jetways
+                   if not jw.obj_ref is None and jw.lcode >= 0)
+
+# apt.dat is streamed as bytes, no decoding and line endings are kept as they are
+with open("Earth nav data.pre_s2n/apt.dat", "rb", buffering = 1 << 20) as f_in, \
+     open("Earth nav data/apt.dat", "wb", buffering = 1 << 20) as f_out:
+    # the added rows get the line ending of the file, e.g. CRLF for Windows-authored sceneries
+    if f_in.readline().endswith(b"\r\n"):
+        jw_block = jw_block.replace("\n", "\r\n")
+    jw_block = jw_block.encode()
+    f_in.seek(0)
+
+    for l in f_in:
+        if l.startswith(b"99"):     # end of file marker, jetways go right before it
+            f_out.write(jw_block)
+            f_out.write(l)
+            break
+        f_out.write(l)
+
+    shutil.copyfileobj(f_in, f_out) # whatever follows the marker
 
 sam_lib_refs = []
 for dsf in dsf_list:
     for o in dsf.object_defs:
         if (o.id >= 0 and
-            (o.name.find("SAM_Library") >= 0 or o.name.find("SAM3_Library") >= 0)):
+            ("SAM_Library" in o.name or "SAM3_Library" in o.name)):
             sam_lib_refs.append(o)
 
 if len (sam_lib_refs) > 0:
     log.warning("There are still refereces to SAM_Library")
     for o in sam_lib_refs:
         log.info(f" {o}")
-else:
+
+# skipped tiles were never converted to text so their OBJECT_DEFs are unknown
+if n_skipped > 0:
+    log.warning(f"Skipped tiles without SAM jetways or docks were not checked for references to SAM*_Library: {n_skipped}")
+    log.warning("-remove_sam_lib_objects processes all tiles and removes every reference to SAM*_Library")
+elif len(sam_lib_refs) == 0:
     log.info("No more references to SAM*_Library found!")
 
 open("Earth nav data/use_autodgs", "w")